@@ -1,17 +1,28 @@
 """FastAPI endpoints para o Reclame Aqui Scraper."""
 
+import functools
+import hashlib
+import json
 import logging
 import os
 import secrets
+import sys
+from contextlib import asynccontextmanager
 from typing import Optional
+from urllib.parse import quote_plus
 
+import msgspec
 from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, HTTPException, Query, Security
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response, Security
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.security import APIKeyHeader
 
-from .models import CompanyInfo, ComplaintsResponse, ErrorResponse
-from .scraper import get_complaints, search_company
+from .cache import RESPONSE_TTL, cache_get, cache_set, close_redis, make_key
+from .models import CompanyInfo, ComplaintsResponse, ComplaintStats, ErrorResponse
+from .scraper import close_http_client, get_complaints, iter_complaints, search_company
+from .stats import service_note_stats
 
 # Carrega variáveis de ambiente
 load_dotenv()
@@ -21,35 +32,40 @@ API_KEY = os.getenv("API_KEY")
 API_KEY_HEADER = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 
-async def verify_api_key(
-    api_key_header: str = Security(API_KEY_HEADER),
-    api_key_query: Optional[str] = Query(None, alias="api_key", description="API Key (alternativa ao header)"),
-) -> str:
-    """
-    Verifica se a API Key é válida.
-    Aceita a chave via header 'X-API-Key' ou query parameter 'api_key'.
-    """
-    if not API_KEY:
-        # Se API_KEY não estiver configurada, permite acesso (dev mode)
+if not API_KEY:
+    # Se API_KEY não estiver configurada, permite acesso (dev mode)
+    async def verify_api_key() -> str:
+        """Modo desenvolvimento: nenhuma API Key configurada, acesso liberado."""
         return "dev-mode"
-    
-    # Usa a chave do header ou da query string
-    api_key = api_key_header or api_key_query
-    
-    if not api_key:
-        raise HTTPException(
-            status_code=401,
-            detail="API Key não fornecida. Use o header 'X-API-Key' ou query parameter 'api_key'.",
-        )
-    
-    # Comparação segura contra timing attacks
-    if not secrets.compare_digest(api_key, API_KEY):
-        raise HTTPException(
-            status_code=403,
-            detail="API Key inválida.",
-        )
-    
-    return api_key
+
+else:
+    _API_KEY_BYTES = API_KEY.encode()
+
+    async def verify_api_key(
+        api_key_header: str = Security(API_KEY_HEADER),
+        api_key_query: Optional[str] = Query(None, alias="api_key", description="API Key (alternativa ao header)"),
+    ) -> str:
+        """
+        Verifica se a API Key é válida.
+        Aceita a chave via header 'X-API-Key' ou query parameter 'api_key'.
+        """
+        # Usa a chave do header ou da query string
+        api_key = api_key_header or api_key_query
+        
+        if not api_key:
+            raise HTTPException(
+                status_code=401,
+                detail="API Key não fornecida. Use o header 'X-API-Key' ou query parameter 'api_key'.",
+            )
+        
+        # Comparação segura contra timing attacks
+        if not secrets.compare_digest(api_key.encode(), _API_KEY_BYTES):
+            raise HTTPException(
+                status_code=403,
+                detail="API Key inválida.",
+            )
+        
+        return api_key
 
 # Configuração de logging
 logging.basicConfig(
@@ -58,6 +74,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Fecha as conexões compartilhadas (Firecrawl e Redis) no shutdown."""
+    yield
+    await close_http_client()
+    await close_redis()
+
+
 # Cria app FastAPI
 app = FastAPI(
     title="Reclame Aqui Scraper API",
@@ -65,6 +89,7 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Configuração CORS
@@ -76,6 +101,46 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compressão gzip das respostas (o streaming SSE não é comprimido)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+
+@functools.lru_cache(maxsize=8)
+def _status_qs(status: Optional[str]) -> str:
+    """Monta o filtro de status da query string (ex: "&status=SOLVED")."""
+    return f"&status={quote_plus(status.upper())}" if status else ""
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Compara o header If-None-Match com o ETag usando comparação fraca.
+
+    Aceita lista separada por vírgulas, "*" e tags fracas (W/"...") geradas
+    por proxies que recomprimem a resposta.
+    """
+    if not if_none_match:
+        return False
+
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+
+    return False
+
+
+def _json_response_with_etag(request: Request, blob: str) -> Response:
+    """Monta a resposta JSON com ETag; responde 304 se o cliente já tem essa versão."""
+    # ETag fraco: o mesmo valor vale para o corpo original e para o comprimido (gzip)
+    etag = f'W/"{hashlib.blake2b(blob.encode(), digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag}
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=blob, media_type="application/json", headers=headers)
+
 
 @app.get("/", tags=["Health"])
 async def root():
@@ -104,12 +169,16 @@ async def health_check():
     tags=["Complaints"],
 )
 async def get_company_complaints(
+    request: Request,
     company_slug: str,
     limit: int = Query(default=10, ge=1, le=100, description="Número de reclamações"),
     status: Optional[str] = Query(
         default=None,
         description="Filtro de status: EVALUATED, NOT_SOLVED, SOLVED",
     ),
+    force_refresh: bool = Query(
+        default=False, description="Ignora o cache e refaz o scraping"
+    ),
     api_key: str = Depends(verify_api_key),
 ):
     """
@@ -119,6 +188,10 @@ async def get_company_complaints(
       (ex: "itau", "magazine-luiza-loja-online", "nubank")
     - **limit**: Número máximo de reclamações a retornar (1-100)
     - **status**: Filtro opcional por status da reclamação
+    - **force_refresh**: Ignora o cache e refaz o scraping
+
+    A resposta completa fica em cache por alguns minutos e inclui um `ETag`;
+    envie `If-None-Match` para receber 304 quando nada mudou.
 
     Exemplos de company_slug:
     - Itaú: `itau`
@@ -128,15 +201,131 @@ async def get_company_complaints(
     """
     try:
         # Monta filtro de status
-        status_filter = ""
-        if status:
-            status_filter = f"&status={status.upper()}"
+        status_filter = _status_qs(status)
+
+        # Tenta a resposta pronta no cache antes de fazer scraping
+        cache_key = make_key("resp", f"{company_slug}:{limit}:{status_filter}")
+        blob = None if force_refresh else await cache_get(cache_key)
+
+        if blob is None:
+            # Faz scraping
+            result = await get_complaints(
+                company_slug=company_slug,
+                limit=limit,
+                status_filter=status_filter,
+                force_refresh=force_refresh,
+            )
+
+            if not result.complaints:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Nenhuma reclamação encontrada para '{company_slug}'",
+                )
+
+            blob = result.model_dump_json()
+            await cache_set(cache_key, blob, RESPONSE_TTL)
+
+        return _json_response_with_etag(request, blob)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao processar requisição: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro interno: {str(e)}",
+        )
+
+
+@app.get(
+    "/api/complaints/{company_slug}/stream",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"text/event-stream": {}}},
+        401: {"model": ErrorResponse, "description": "API Key não fornecida"},
+        403: {"model": ErrorResponse, "description": "API Key inválida"},
+    },
+    tags=["Complaints"],
+)
+async def stream_company_complaints(
+    company_slug: str,
+    limit: int = Query(default=10, ge=1, le=100, description="Número de reclamações"),
+    status: Optional[str] = Query(
+        default=None,
+        description="Filtro de status: EVALUATED, NOT_SOLVED, SOLVED",
+    ),
+    force_refresh: bool = Query(
+        default=False, description="Ignora o cache e refaz o scraping"
+    ),
+    api_key: str = Depends(verify_api_key),
+):
+    """
+    Obtém as últimas reclamações de uma empresa via Server-Sent Events.
+
+    Mesmos parâmetros de `/api/complaints/{company_slug}`, mas cada reclamação
+    é enviada como um evento `data:` assim que o scraping dela termina.
+    Ao final é enviado um evento `end`; em caso de falha, um evento `error`.
+    """
+    status_filter = _status_qs(status)
+
+    async def event_stream():
+        try:
+            async for complaint in iter_complaints(
+                company_slug=company_slug,
+                limit=limit,
+                status_filter=status_filter,
+                force_refresh=force_refresh,
+            ):
+                yield f"data: {msgspec.json.encode(complaint).decode()}\n\n"
+        except Exception as e:
+            logger.error(f"Erro no streaming de reclamações: {e}")
+            payload = json.dumps({"detail": f"Erro interno: {str(e)}"})
+            yield f"event: error\ndata: {payload}\n\n"
+            return
+
+        yield "event: end\ndata: {}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-        # Faz scraping
-        result = get_complaints(
+
+@app.get(
+    "/api/complaints/{company_slug}/stats",
+    response_model=ComplaintStats,
+    responses={
+        401: {"model": ErrorResponse, "description": "API Key não fornecida"},
+        403: {"model": ErrorResponse, "description": "API Key inválida"},
+        500: {"model": ErrorResponse},
+    },
+    tags=["Complaints"],
+)
+async def get_company_complaint_stats(
+    company_slug: str,
+    limit: int = Query(default=10, ge=1, le=100, description="Número de reclamações"),
+    status: Optional[str] = Query(
+        default=None,
+        description="Filtro de status: EVALUATED, NOT_SOLVED, SOLVED",
+    ),
+    force_refresh: bool = Query(
+        default=False, description="Ignora o cache e refaz o scraping"
+    ),
+    api_key: str = Depends(verify_api_key),
+):
+    """
+    Estatísticas das avaliações finais das últimas reclamações de uma empresa.
+
+    Mesmos parâmetros de `/api/complaints/{company_slug}`. Retorna a nota média
+    do atendimento e o histograma das notas (0-10).
+    """
+    try:
+        result = await get_complaints(
             company_slug=company_slug,
             limit=limit,
-            status_filter=status_filter,
+            status_filter=_status_qs(status),
+            force_refresh=force_refresh,
         )
 
         if not result.complaints:
@@ -145,12 +334,20 @@ async def get_company_complaints(
                 detail=f"Nenhuma reclamação encontrada para '{company_slug}'",
             )
 
-        return result
+        total_rated, mean_note, histogram = service_note_stats(result.complaints)
+
+        return ComplaintStats(
+            company=result.company,
+            total_returned=result.total_returned,
+            total_rated=total_rated,
+            mean_service_note=mean_note,
+            service_note_histogram=histogram,
+        )
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Erro ao processar requisição: {e}")
+        logger.error(f"Erro ao calcular estatísticas: {e}")
         raise HTTPException(
             status_code=500,
             detail=f"Erro interno: {str(e)}",
@@ -168,17 +365,21 @@ async def get_company_complaints(
 )
 async def search_companies(
     q: str = Query(..., min_length=2, description="Termo de busca"),
+    force_refresh: bool = Query(
+        default=False, description="Ignora o cache e refaz a busca"
+    ),
     api_key: str = Depends(verify_api_key),
 ):
     """
     Busca empresas pelo nome.
 
     - **q**: Termo de busca (mínimo 2 caracteres)
+    - **force_refresh**: Ignora o cache e refaz a busca
 
     Retorna lista de empresas com nome e slug.
     """
     try:
-        companies = search_company(q)
+        companies = await search_company(q, force_refresh=force_refresh)
 
         if not companies:
             raise HTTPException(
@@ -204,5 +405,16 @@ if __name__ == "__main__":
 
     host = os.getenv("API_HOST", "0.0.0.0")
     port = int(os.getenv("API_PORT", 8000))
-
-    uvicorn.run("src.api:app", host=host, port=port, reload=True)
+    # Cada worker tem seu próprio limite FIRECRAWL_CONCURRENCY; mantenha poucos
+    workers = int(os.getenv("API_WORKERS", 2))
+
+    uvicorn.run(
+        "src.api:app",
+        host=host,
+        port=port,
+        workers=workers,
+        # uvloop não tem suporte a Windows
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        reload=False,
+    )
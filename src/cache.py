@@ -0,0 +1,87 @@
+"""Cache Redis para o Reclame Aqui Scraper."""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Optional
+
+from dotenv import load_dotenv
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+# Carrega variáveis de ambiente
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Se REDIS_URL não estiver configurada, o cache fica desabilitado (dev mode)
+REDIS_URL = os.getenv("REDIS_URL")
+
+# TTLs em segundos
+LIST_PAGE_TTL = int(os.getenv("CACHE_TTL_LIST_PAGE", 300))
+COMPLAINT_PAGE_TTL = int(os.getenv("CACHE_TTL_COMPLAINT_PAGE", 3600))
+SEARCH_TTL = int(os.getenv("CACHE_TTL_SEARCH", 3600))
+RESPONSE_TTL = int(os.getenv("CACHE_TTL_RESPONSE", 600))
+
+# Timeouts curtos (segundos): com o Redis fora do ar, cai logo para o Firecrawl
+REDIS_TIMEOUT = float(os.getenv("REDIS_TIMEOUT", 1))
+
+redis_client: Optional[Redis] = (
+    Redis.from_url(
+        REDIS_URL,
+        decode_responses=True,
+        socket_connect_timeout=REDIS_TIMEOUT,
+        socket_timeout=REDIS_TIMEOUT,
+    )
+    if REDIS_URL
+    else None
+)
+
+
+async def close_redis() -> None:
+    """Fecha a conexão com o Redis (chamado no shutdown da API)."""
+    if redis_client is not None:
+        await redis_client.aclose()
+
+
+def make_key(namespace: str, value: str) -> str:
+    """Monta a chave do cache no formato ra:{namespace}:{sha1(value)}."""
+    digest = hashlib.sha1(value.encode("utf-8")).hexdigest()
+    return f"ra:{namespace}:{digest}"
+
+
+async def cache_get(key: str) -> Optional[str]:
+    """Lê uma chave do cache. Retorna None em caso de miss ou erro."""
+    if redis_client is None:
+        return None
+
+    try:
+        return await redis_client.get(key)
+    except RedisError as e:
+        logger.warning(f"Erro ao ler do Redis: {e}")
+        return None
+
+
+async def cache_set(key: str, value: str, ttl: int) -> None:
+    """Grava uma chave no cache com expiração. Erros são apenas logados."""
+    if redis_client is None:
+        return
+
+    try:
+        await redis_client.setex(key, ttl, value)
+    except RedisError as e:
+        logger.warning(f"Erro ao gravar no Redis: {e}")
+
+
+async def cache_get_json(key: str) -> Optional[Any]:
+    """Lê um valor JSON do cache."""
+    blob = await cache_get(key)
+    if blob is None:
+        return None
+    return json.loads(blob)
+
+
+async def cache_set_json(key: str, value: Any, ttl: int) -> None:
+    """Grava um valor serializável em JSON no cache."""
+    await cache_set(key, json.dumps(value), ttl)
@@ -1,12 +1,19 @@
 """Modelos de dados para o Reclame Aqui Scraper."""
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
-from pydantic import BaseModel, Field
+import msgspec
+from pydantic import BaseModel, ConfigDict, Field
 
 
-class ChatMessage(BaseModel):
+class _BaseModel(BaseModel):
+    """Base dos modelos da API, com a configuração comum do Pydantic v2."""
+
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True)
+
+
+class ChatMessage(_BaseModel):
     """Mensagem de chat entre consumidor e empresa."""
 
     owner: str = Field(..., description="Autor da mensagem (consumidor ou empresa)")
@@ -14,7 +21,7 @@ class ChatMessage(BaseModel):
     message: str = Field(..., description="Conteúdo da mensagem")
 
 
-class FinalConsideration(BaseModel):
+class FinalConsideration(_BaseModel):
     """Avaliação final do consumidor após resposta da empresa."""
 
     message: Optional[str] = Field(None, description="Comentário final do consumidor")
@@ -25,7 +32,7 @@ class FinalConsideration(BaseModel):
     date: Optional[str] = Field(None, description="Data da avaliação")
 
 
-class Complaint(BaseModel):
+class Complaint(_BaseModel):
     """Reclamação completa do Reclame Aqui."""
 
     id: str = Field(..., description="ID da reclamação")
@@ -44,7 +51,7 @@ class Complaint(BaseModel):
     url: str = Field(..., description="URL da reclamação")
 
 
-class CompanyInfo(BaseModel):
+class CompanyInfo(_BaseModel):
     """Informações básicas da empresa."""
 
     name: str = Field(..., description="Nome da empresa")
@@ -54,20 +61,99 @@ class CompanyInfo(BaseModel):
     )
 
 
-class ComplaintsResponse(BaseModel):
+class ComplaintsResponse(_BaseModel):
     """Resposta da API com lista de reclamações."""
 
     company: CompanyInfo
     complaints: list[Complaint]
     total_returned: int = Field(..., description="Quantidade de reclamações retornadas")
     scraped_at: datetime = Field(
-        default_factory=datetime.now, description="Data/hora do scraping"
+        default_factory=lambda: datetime.now(timezone.utc),
+        description="Data/hora do scraping (UTC)",
     )
 
 
-class ErrorResponse(BaseModel):
+class ComplaintStats(_BaseModel):
+    """Estatísticas das avaliações finais das reclamações de uma empresa."""
+
+    company: CompanyInfo
+    total_returned: int = Field(..., description="Quantidade de reclamações analisadas")
+    total_rated: int = Field(..., description="Reclamações com nota de atendimento")
+    mean_service_note: Optional[float] = Field(
+        None, description="Nota média do atendimento (0-10)"
+    )
+    service_note_histogram: list[int] = Field(
+        ..., description="Quantidade de avaliações por nota (índice = nota, 0-10)"
+    )
+    scraped_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        description="Data/hora do scraping (UTC)",
+    )
+
+
+class ErrorResponse(_BaseModel):
     """Resposta de erro da API."""
 
     error: str
     detail: Optional[str] = None
     status_code: int
+
+
+# Structs internos (msgspec) usados durante o scraping. Os dados vêm do nosso
+# próprio parsing, então não passam pela validação do Pydantic; a conversão
+# para os modelos acima acontece só na fronteira da API.
+
+
+class ChatMessageMsg(msgspec.Struct, frozen=True, gc=False):
+    """Versão interna de ChatMessage."""
+
+    owner: str
+    date: str
+    message: str
+
+    def to_model(self) -> ChatMessage:
+        return ChatMessage.model_construct(**msgspec.structs.asdict(self))
+
+
+class FinalConsiderationMsg(msgspec.Struct, frozen=True, gc=False):
+    """Versão interna de FinalConsideration."""
+
+    message: Optional[str] = None
+    service_note: Optional[str] = None
+    would_do_business_again: Optional[str] = None
+    date: Optional[str] = None
+
+    def to_model(self) -> FinalConsideration:
+        return FinalConsideration.model_construct(**msgspec.structs.asdict(self))
+
+
+class ComplaintMsg(msgspec.Struct, frozen=True, gc=False, kw_only=True):
+    """Versão interna de Complaint. Serializa no mesmo formato JSON."""
+
+    id: str
+    title: str
+    description: str
+    status: str
+    date: str
+    location: Optional[str] = None
+    tags: list[str] = []
+    chat: list[ChatMessageMsg] = []
+    final_consideration: Optional[FinalConsiderationMsg] = None
+    url: str
+
+    def to_model(self) -> Complaint:
+        """Converte para o modelo Pydantic sem revalidar."""
+        return Complaint.model_construct(
+            id=self.id,
+            title=self.title,
+            description=self.description,
+            status=self.status,
+            date=self.date,
+            location=self.location,
+            tags=list(self.tags),
+            chat=[message.to_model() for message in self.chat],
+            final_consideration=self.final_consideration.to_model()
+            if self.final_consideration
+            else None,
+            url=self.url,
+        )
@@ -1,21 +1,41 @@
 """Core do scraper para o Reclame Aqui usando Firecrawl."""
 
+import asyncio
+import functools
 import logging
 import os
 import re
 from datetime import datetime
-from typing import Optional
+from typing import AsyncIterator, Optional
+from urllib.parse import quote_plus
 
-from bs4 import BeautifulSoup
+import httpx
+from async_lru import alru_cache
 from dotenv import load_dotenv
-from firecrawl import Firecrawl
+from selectolax.lexbor import LexborHTMLParser
+from tenacity import (
+    before_sleep_log,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 
+from .cache import (
+    COMPLAINT_PAGE_TTL,
+    LIST_PAGE_TTL,
+    SEARCH_TTL,
+    cache_get_json,
+    cache_set_json,
+    make_key,
+)
 from .models import (
-    ChatMessage,
+    ChatMessageMsg,
     Complaint,
+    ComplaintMsg,
     CompanyInfo,
     ComplaintsResponse,
-    FinalConsideration,
+    FinalConsiderationMsg,
 )
 
 # Carrega variáveis de ambiente
@@ -23,71 +43,203 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-# Inicializa o cliente Firecrawl
+# Inicializa o cliente HTTP do Firecrawl
 FIRECRAWL_API_KEY = os.getenv("FIRECRAWL_API_KEY")
 if not FIRECRAWL_API_KEY:
     raise ValueError("FIRECRAWL_API_KEY não configurada. Verifique o arquivo .env")
 
-firecrawl = Firecrawl(api_key=FIRECRAWL_API_KEY)
+FIRECRAWL_API_URL = os.getenv("FIRECRAWL_API_URL", "https://api.firecrawl.dev")
+REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", 30))
+
+# Cliente único com keep-alive e HTTP/2, reaproveitando conexões entre chamadas.
+# Criado sob demanda (ver _get_http_client) para sobreviver a um shutdown da API.
+_http_client: Optional[httpx.AsyncClient] = None
 
 BASE_URL = "https://www.reclameaqui.com.br"
 
+# Formatos pedidos ao Firecrawl: a lista só precisa do markdown; a página
+# da reclamação usa os dois (markdown para o texto, HTML para chat e avaliação)
+_LIST_FORMATS = ("markdown",)
+_COMPLAINT_FORMATS = ("html", "markdown")
+
+# Paginação da lista de reclamações
+_COMPLAINTS_PER_PAGE = 10
+_MAX_LIST_PAGES = 10
+
+# Limite de chamadas simultâneas ao Firecrawl (por processo) e política de retry
+FIRECRAWL_CONCURRENCY = int(os.getenv("FIRECRAWL_CONCURRENCY", 8))
+MAX_RETRIES = int(os.getenv("MAX_RETRIES", 3))
+RETRY_DELAY = float(os.getenv("RETRY_DELAY", 1))
+
+_FC_SEM = asyncio.Semaphore(FIRECRAWL_CONCURRENCY)
+
+# Regexes pré-compiladas (usadas a cada reclamação processada)
+_TITLE_RE = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+_ID_RE = re.compile(r'\*\*ID:\*\*\s*(\d+)')
+_URL_ID_RE = re.compile(r'_([a-zA-Z0-9]+)/?$')
+_STATUS_RES = (
+    re.compile(r'!\[Reclamação[^\]]*\]\([^)]+\)\s*\n+([^\n\[]+)'),
+    re.compile(r'Status da reclamação:\s*\n+[^\n]*\n+([^\n]+)'),
+)
+_LOC_DATE_RE = re.compile(
+    r'\[Reclamar dessa empresa\][^\n]*\n+([^\n]+)\n+(\d{2}/\d{2}/\d{4}[^\n]*)'
+)
+_DATE_RE = re.compile(r'(\d{2}/\d{2}/\d{4}\s+às\s+\d{2}:\d{2})')
+_DESC_RE = re.compile(
+    r'\*\*ID:\*\*\s*\d+\s*\n+(?:Status da reclamação:[^\n]*\n+[^\n]*\n+)?([^\n]+(?:\n+[^\n]+)*?)(?:\n+Deixe sua rea|\n+Compartilhe|\n+\[RA Ads\])'
+)
+# Sequências de imagens markdown e quebras de linha: viram um espaço se houver
+# quebra de linha solta (fora de uma imagem), ou somem se forem só imagens
+_DESC_CLEAN_RE = re.compile(r'(?:!\[[^\]]*\]\([^)]+\)|(\n))+')
+_PAGINATION_RE = re.compile(r'(\d+)\s+de\s+(\d+)')
+_DIGITS_RE = re.compile(r"\d+")
+_SEARCH_LINK_RE = re.compile(
+    r'\[([^\]]+)\]\((https://www\.reclameaqui\.com\.br/empresa/([^/\)]+)/?)\)'
+)
+# Classes geradas pelo styled-components (ex: "sc-1pe7b5t-0")
+_SC_CLASS_SELECTOR = '{tag}[class*="sc-"]'
+_LIST_LINK_TEMPLATE = r'\[([^\]]+)\]\((https://www\.reclameaqui\.com\.br/{slug}/[^)]+)\)'
+
+
+@functools.lru_cache(maxsize=256)
+def _list_pattern(company_slug: str) -> re.Pattern:
+    """Regex de links de reclamações da página de lista, compilada por empresa."""
+    # re.escape evita que caracteres do slug sejam interpretados como regex
+    return re.compile(_LIST_LINK_TEMPLATE.format(slug=re.escape(company_slug)))
+
+
+@functools.lru_cache(maxsize=4096)
+def _slug_to_display(company_slug: str) -> str:
+    """Converte o slug da empresa em um nome legível (ex: "magazine-luiza" -> "Magazine Luiza")."""
+    return company_slug.replace("-", " ").title()
+
+
+@functools.lru_cache(maxsize=1024)
+def _search_url(query: str) -> str:
+    """Monta a URL de busca do Reclame Aqui com o termo codificado."""
+    return f"{BASE_URL}/busca/?q={quote_plus(query)}"
+
 
 class ScraperError(Exception):
     """Erro durante o scraping."""
     pass
 
 
-def _scrape_url(url: str) -> str:
-    """Faz scraping de uma URL usando Firecrawl e retorna o HTML."""
+def _get_http_client() -> httpx.AsyncClient:
+    """Retorna o cliente HTTP do Firecrawl, criando um novo se ainda não existe ou foi fechado."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            base_url=FIRECRAWL_API_URL,
+            http2=True,
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+            headers={"Authorization": f"Bearer {FIRECRAWL_API_KEY}"},
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Fecha o cliente HTTP do Firecrawl (chamado no shutdown da API)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Indica se uma falha do Firecrawl vale nova tentativa (rede, 429 ou 5xx)."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, (httpx.TransportError, ScraperError))
+
+
+@retry(
+    wait=wait_exponential_jitter(initial=RETRY_DELAY, max=30),
+    stop=stop_after_attempt(MAX_RETRIES + 1),
+    retry=retry_if_exception(_is_transient),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True,
+)
+async def _firecrawl_request(payload: dict) -> dict:
+    """
+    Faz POST /v2/scrape com concorrência limitada por _FC_SEM.
+
+    Falhas transitórias são repetidas com backoff exponencial; o semáforo é
+    liberado durante a espera.
+    """
+    async with _FC_SEM:
+        response = await _get_http_client().post("/v2/scrape", json=payload)
+        response.raise_for_status()
+        body = response.json()
+
+    if not body.get("success"):
+        raise ScraperError(f"Firecrawl retornou erro: {body.get('error')}")
+
+    return body.get("data") or {}
+
+
+async def _firecrawl_scrape(url: str, **options) -> dict:
+    """Faz scraping de uma URL no Firecrawl e retorna o documento (dict)."""
     try:
-        logger.info(f"Firecrawl scraping: {url}")
-        result = firecrawl.scrape(url, formats=["html"])
-        
-        if result and hasattr(result, 'html'):
-            return result.html
-        elif isinstance(result, dict) and 'html' in result:
-            return result['html']
-        else:
-            logger.warning(f"Resultado inesperado do Firecrawl: {type(result)}")
-            return ""
-    except Exception as e:
-        logger.error(f"Erro no Firecrawl: {e}")
-        raise ScraperError(f"Erro ao fazer scraping de {url}: {e}")
+        return await _firecrawl_request({"url": url, **options})
+    except (httpx.HTTPError, ValueError) as e:
+        raise ScraperError(f"Erro ao fazer scraping de {url}: {e}") from e
+
 
+async def _scrape(
+    url: str,
+    force_refresh: bool = False,
+    formats: tuple[str, ...] = _COMPLAINT_FORMATS,
+) -> tuple[str, str]:
+    """
+    Faz scraping de uma URL usando Firecrawl e retorna (html, markdown).
+
+    Os formatos pedidos vêm de uma única chamada e são guardados juntos no
+    Redis; formato não pedido volta como string vazia. Páginas de lista
+    expiram mais rápido que páginas de reclamação, que praticamente não mudam.
+    """
+    key = make_key("page", f"{','.join(formats)}:{url}")
+    if not force_refresh:
+        cached = await cache_get_json(key)
+        if cached is not None:
+            logger.info(f"Cache hit: {url}")
+            return cached[0], cached[1]
 
-def _scrape_url_markdown(url: str) -> str:
-    """Faz scraping de uma URL usando Firecrawl e retorna markdown."""
     try:
-        logger.info(f"Firecrawl scraping (markdown): {url}")
-        result = firecrawl.scrape(url, formats=["markdown"])
-        
-        if result and hasattr(result, 'markdown'):
-            return result.markdown
-        elif isinstance(result, dict) and 'markdown' in result:
-            return result['markdown']
-        else:
-            logger.warning(f"Resultado inesperado do Firecrawl: {type(result)}")
-            return ""
-    except Exception as e:
+        logger.info(f"Firecrawl scraping: {url}")
+        result = await _firecrawl_scrape(url, formats=list(formats))
+    except ScraperError as e:
         logger.error(f"Erro no Firecrawl: {e}")
-        raise ScraperError(f"Erro ao fazer scraping de {url}: {e}")
+        raise
+
+    html = result.get("html") or ""
+    markdown = result.get("markdown") or ""
+    if not html and not markdown:
+        logger.warning(f"Resultado inesperado do Firecrawl: {list(result)}")
+        return "", ""
+
+    ttl = LIST_PAGE_TTL if "/lista-reclamacoes/" in url else COMPLAINT_PAGE_TTL
+    await cache_set_json(key, [html, markdown], ttl)
+    return html, markdown
 
 
 def get_complaint_urls_from_markdown(markdown: str, company_slug: str, limit: int = 10) -> list[str]:
     """Extrai URLs de reclamações do markdown da página de lista."""
+    seen: set[str] = set()
     urls: list[str] = []
     
     # Regex para encontrar links de reclamações no markdown
     # Formato: [título](https://www.reclameaqui.com.br/empresa/titulo-reclamacao_ID/)
-    pattern = rf'\[([^\]]+)\]\((https://www\.reclameaqui\.com\.br/{company_slug}/[^)]+)\)'
-    matches = re.findall(pattern, markdown)
+    matches = _list_pattern(company_slug).findall(markdown)
     
     logger.info(f"Regex encontrou {len(matches)} matches para {company_slug}")
     
     for title, url in matches:
         # Filtra URLs que parecem ser reclamações (têm underscore seguido de ID)
-        if "_" in url and url not in urls:
+        if "_" in url and url not in seen:
+            seen.add(url)
             urls.append(url)
             logger.info(f"URL encontrada: {url[:80]}...")
             if len(urls) >= limit:
@@ -96,37 +248,54 @@ def get_complaint_urls_from_markdown(markdown: str, company_slug: str, limit: in
     return urls
 
 
-def get_total_pages(company_slug: str) -> int:
-    """Retorna o total de páginas de reclamações disponíveis."""
-    try:
-        url = f"{BASE_URL}/empresa/{company_slug}/lista-reclamacoes/"
-        markdown = _scrape_url_markdown(url)
-        
-        # Procura por "Página X de Y" ou similar
-        match = re.search(r'(\d+)\s+de\s+(\d+)', markdown)
-        if match:
-            total = int(match.group(2))
-            return min(total, 50)  # Máximo 50 páginas
-        
-        return 1
-    except Exception as e:
-        logger.error(f"Erro ao obter total de páginas: {e}")
-        return 1
+def get_total_pages(markdown: str) -> int:
+    """Extrai o total de páginas de reclamações do markdown da página de lista."""
+    # Procura por "Página X de Y" ou similar
+    match = _PAGINATION_RE.search(markdown)
+    if match:
+        return min(int(match.group(2)), 50)  # Máximo 50 páginas
+
+    return 1
+
 
+async def get_complaint_urls(
+    company_slug: str,
+    limit: int = 10,
+    status_filter: str = "",
+    force_refresh: bool = False,
+) -> tuple[list[str], int]:
+    """
+    Coleta URLs das reclamações da lista usando Firecrawl.
 
-def get_complaint_urls(
-    company_slug: str, limit: int = 10, status_filter: str = ""
-) -> list[str]:
-    """Coleta URLs das reclamações da lista usando Firecrawl."""
+    Retorna também o total de páginas, lido do markdown da primeira página
+    para evitar uma chamada extra ao Firecrawl.
+    """
     urls: list[str] = []
+    total_pages = 1
     page = 1
-    
-    while len(urls) < limit:
-        list_url = f"{BASE_URL}/empresa/{company_slug}/lista-reclamacoes/?pagina={page}{status_filter}"
-        
-        try:
-            markdown = _scrape_url_markdown(list_url)
-            page_urls = get_complaint_urls_from_markdown(markdown, company_slug, limit - len(urls))
+
+    def list_url(page: int) -> str:
+        return f"{BASE_URL}/empresa/{company_slug}/lista-reclamacoes/?pagina={page}{status_filter}"
+
+    next_task: Optional[asyncio.Task] = asyncio.create_task(_scrape(list_url(page), force_refresh, _LIST_FORMATS))
+    try:
+        while next_task is not None:
+            try:
+                _, markdown = await next_task
+            except ScraperError as e:
+                logger.error(f"Erro ao coletar URLs da página {page}: {e}")
+                break
+
+            next_task = None
+            if page == 1:
+                total_pages = get_total_pages(markdown)
+
+            # Se esta página não vai bastar, já dispara a próxima enquanto faz o parse
+            remaining = limit - len(urls)
+            if remaining > _COMPLAINTS_PER_PAGE and page < min(total_pages, _MAX_LIST_PAGES):
+                next_task = asyncio.create_task(_scrape(list_url(page + 1), force_refresh, _LIST_FORMATS))
+
+            page_urls = get_complaint_urls_from_markdown(markdown, company_slug, remaining)
             
             if not page_urls:
                 logger.warning(f"Nenhuma URL encontrada na página {page}")
@@ -135,42 +304,49 @@ def get_complaint_urls(
             urls.extend(page_urls)
             logger.info(f"Página {page}: encontradas {len(page_urls)} URLs")
             
+            if len(urls) >= limit:
+                break
+
             page += 1
             
             # Limite de páginas para evitar loop infinito
-            if page > 10:
+            if page > _MAX_LIST_PAGES:
                 break
-                
-        except ScraperError as e:
-            logger.error(f"Erro ao coletar URLs da página {page}: {e}")
-            break
 
-    return urls[:limit]
+            if next_task is None:
+                next_task = asyncio.create_task(_scrape(list_url(page), force_refresh, _LIST_FORMATS))
+    finally:
+        # Saída antecipada: cancela a página pré-carregada que não será usada
+        if next_task is not None:
+            if next_task.done() and not next_task.cancelled():
+                next_task.exception()  # evita aviso de exceção não lida
+            else:
+                next_task.cancel()
+
+    return urls[:limit], total_pages
 
 
-def _parse_chat_from_html(soup: BeautifulSoup) -> list[ChatMessage]:
+def _parse_chat_from_html(tree: LexborHTMLParser) -> list[ChatMessageMsg]:
     """Extrai histórico de chat da reclamação."""
-    chat_messages: list[ChatMessage] = []
+    chat_messages: list[ChatMessageMsg] = []
 
-    interaction_list = soup.find("div", {"data-testid": "complaint-interaction-list"})
+    interaction_list = tree.css_first('div[data-testid="complaint-interaction-list"]')
     if not interaction_list:
         return chat_messages
 
-    for container in interaction_list.find_all(
-        "div", {"data-testid": "complaint-interaction"}
-    ):
+    for container in interaction_list.css('div[data-testid="complaint-interaction"]'):
         try:
-            owner_elem = container.find("h2")
-            date_elem = container.find("span", class_=re.compile(r"sc-"))
-            message_elem = container.find("p")
+            owner_elem = container.css_first("h2")
+            date_elem = container.css_first(_SC_CLASS_SELECTOR.format(tag="span"))
+            message_elem = container.css_first("p")
 
             if owner_elem and message_elem:
-                if not container.find("h2", {"type": "FINAL_ANSWER"}):
+                if not container.css_first('h2[type="FINAL_ANSWER"]'):
                     chat_messages.append(
-                        ChatMessage(
-                            owner=owner_elem.text.strip(),
-                            date=date_elem.text.strip() if date_elem else "",
-                            message=message_elem.text.strip(),
+                        ChatMessageMsg(
+                            owner=owner_elem.text().strip(),
+                            date=date_elem.text().strip() if date_elem else "",
+                            message=message_elem.text().strip(),
                         )
                     )
         except Exception as e:
@@ -179,81 +355,86 @@ def _parse_chat_from_html(soup: BeautifulSoup) -> list[ChatMessage]:
     return chat_messages
 
 
-def _parse_final_consideration_from_html(soup: BeautifulSoup) -> Optional[FinalConsideration]:
+def _parse_final_consideration_from_html(tree: LexborHTMLParser) -> Optional[FinalConsiderationMsg]:
     """Extrai avaliação final do consumidor."""
-    evaluation = soup.find("div", {"data-testid": "complaint-evaluation-interaction"})
+    evaluation = tree.css_first('div[data-testid="complaint-evaluation-interaction"]')
 
     if not evaluation:
         return None
 
     try:
-        message_elem = evaluation.find("div", {"data-testid": "complaint-interaction"})
-        date_elem = evaluation.find("span")
-        business_elem = evaluation.find("div", {"data-testid": "complaint-deal-again"})
+        message_elem = evaluation.css_first('div[data-testid="complaint-interaction"] p')
+        date_elem = evaluation.css_first("span")
+        business_elem = evaluation.css_first('div[data-testid="complaint-deal-again"]')
 
         service_note = None
-        note_matches = re.findall(r"\d+", evaluation.text)
+        note_matches = _DIGITS_RE.findall(evaluation.text())
         if note_matches:
             service_note = note_matches[-1]
 
-        return FinalConsideration(
-            message=message_elem.find("p").text.strip()
-            if message_elem and message_elem.find("p")
-            else None,
+        return FinalConsiderationMsg(
+            message=message_elem.text().strip() if message_elem else None,
             service_note=service_note,
-            would_do_business_again=business_elem.text.strip()
+            would_do_business_again=business_elem.text().strip()
             if business_elem
             else None,
-            date=date_elem.text.strip() if date_elem else None,
+            date=date_elem.text().strip() if date_elem else None,
         )
     except Exception as e:
         logger.warning(f"Erro ao parsear avaliação final: {e}")
         return None
 
 
-def _parse_tags_from_html(soup: BeautifulSoup) -> list[str]:
+def _parse_tags_from_html(tree: LexborHTMLParser) -> list[str]:
     """Extrai tags/categorias da reclamação."""
     tags: list[str] = []
 
-    tag_list = soup.find("ul", class_=re.compile(r"sc-"))
+    tag_list = tree.css_first(_SC_CLASS_SELECTOR.format(tag="ul"))
     if tag_list:
-        for tag in tag_list.find_all("li"):
-            tags.append(tag.text.strip())
+        for tag in tag_list.css("li"):
+            tags.append(tag.text().strip())
 
     return tags
 
 
-def scrape_complaint(url: str) -> Optional[Complaint]:
-    """Extrai dados de uma reclamação específica usando Firecrawl (markdown)."""
+def _clean_description_match(match: re.Match) -> str:
+    """Substituição usada por _DESC_CLEAN_RE: quebras de linha viram espaço, imagens somem."""
+    # group(1) só é preenchido por quebras de linha soltas, não as de dentro de imagens
+    return " " if match.group(1) else ""
+
+
+async def scrape_complaint(url: str, force_refresh: bool = False) -> Optional[ComplaintMsg]:
+    """
+    Extrai dados de uma reclamação específica usando Firecrawl.
+
+    Os campos principais vêm do markdown; chat e avaliação final vêm do HTML
+    retornado na mesma chamada.
+    """
     try:
-        markdown = _scrape_url_markdown(url)
+        html, markdown = await _scrape(url, force_refresh)
         if not markdown:
             logger.warning(f"Markdown vazio para: {url}")
             return None
         
         # Extrai título (primeira linha com #)
-        title_match = re.search(r'^#\s+(.+)$', markdown, re.MULTILINE)
+        title_match = _TITLE_RE.search(markdown)
         title = title_match.group(1).strip() if title_match else "Sem título"
         
         # Extrai ID
-        id_match = re.search(r'\*\*ID:\*\*\s*(\d+)', markdown)
+        id_match = _ID_RE.search(markdown)
         complaint_id = id_match.group(1) if id_match else ""
         
         # Se não encontrou no markdown, tenta extrair da URL
         if not complaint_id:
-            url_id_match = re.search(r'_([a-zA-Z0-9]+)/?$', url)
+            url_id_match = _URL_ID_RE.search(url)
             if url_id_match:
                 complaint_id = url_id_match.group(1)
         
         # Extrai status (aparece após imagem com "Reclamação")
         status = "Desconhecido"
         # Procura por padrões como "Não respondida", "Respondida", "Resolvido"
-        status_patterns = [
-            r'!\[Reclamação[^\]]*\]\([^)]+\)\s*\n+([^\n\[]+)',
-            r'Status da reclamação:\s*\n+[^\n]*\n+([^\n]+)',
-        ]
-        for pattern in status_patterns:
-            status_match = re.search(pattern, markdown)
+        for pattern in _STATUS_RES:
+            status_match = pattern.search(markdown)
             if status_match:
                 potential_status = status_match.group(1).strip()
                 if potential_status and len(potential_status) < 50:
@@ -266,37 +447,32 @@ def scrape_complaint(url: str) -> Optional[Complaint]:
         date = ""
         
         # Procura pela seção que contém local e data
-        loc_date_match = re.search(
-            r'\[Reclamar dessa empresa\][^\n]*\n+([^\n]+)\n+(\d{2}/\d{2}/\d{4}[^\n]*)',
-            markdown
-        )
+        loc_date_match = _LOC_DATE_RE.search(markdown)
         if loc_date_match:
             location = loc_date_match.group(1).strip()
             date = loc_date_match.group(2).strip()
         else:
             # Tenta só a data
-            date_match = re.search(r'(\d{2}/\d{2}/\d{4}\s+às\s+\d{2}:\d{2})', markdown)
+            date_match = _DATE_RE.search(markdown)
             if date_match:
                 date = date_match.group(1)
         
         # Extrai descrição (texto principal após o ID)
         description = ""
         # A descrição geralmente vem após "**ID:** XXXXX" e antes de "Deixe sua reação"
-        desc_match = re.search(
-            r'\*\*ID:\*\*\s*\d+\s*\n+(?:Status da reclamação:[^\n]*\n+[^\n]*\n+)?([^\n]+(?:\n+[^\n]+)*?)(?:\n+Deixe sua rea|\n+Compartilhe|\n+\[RA Ads\])',
-            markdown
-        )
+        desc_match = _DESC_RE.search(markdown)
         if desc_match:
-            description = desc_match.group(1).strip()
-            # Remove linhas que são imagens ou links
-            description = re.sub(r'!\[[^\]]*\]\([^)]+\)', '', description)
-            description = re.sub(r'\n+', ' ', description).strip()
+            # Remove imagens e junta as linhas numa única passada
+            description = _DESC_CLEAN_RE.sub(_clean_description_match, desc_match.group(1)).strip()
         
         if not title or title == "Sem título":
             logger.warning(f"Título não encontrado: {url}")
             return None
         
-        return Complaint(
+        # Uma única árvore HTML para chat e avaliação final
+        tree = LexborHTMLParser(html) if html else None
+
+        return ComplaintMsg(
             id=complaint_id,
             title=title,
             description=description,
@@ -304,8 +480,10 @@ def scrape_complaint(url: str) -> Optional[Complaint]:
             date=date,
             location=location,
             tags=[],  # Tags requerem parsing mais complexo
-            chat=[],  # Chat requer parsing adicional
-            final_consideration=None,  # Avaliação final requer parsing adicional
+            chat=_parse_chat_from_html(tree) if tree is not None else [],
+            final_consideration=_parse_final_consideration_from_html(tree)
+            if tree is not None
+            else None,
             url=url,
         )
 
@@ -317,10 +495,11 @@ def scrape_complaint(url: str) -> Optional[Complaint]:
         return None
 
 
-def get_complaints(
+async def get_complaints(
     company_slug: str,
     limit: int = 10,
     status_filter: str = "",
+    force_refresh: bool = False,
 ) -> ComplaintsResponse:
     """
     Obtém as últimas reclamações de uma empresa usando Firecrawl.
@@ -329,30 +508,36 @@ def get_complaints(
         company_slug: Slug da empresa (ex: "nubank", "magazine-luiza-loja-online")
         limit: Número máximo de reclamações a retornar
         status_filter: Filtro de status opcional (ex: "&status=SOLVED")
+        force_refresh: Ignora o cache e refaz o scraping no Firecrawl
 
     Returns:
         ComplaintsResponse com as reclamações encontradas
     """
     logger.info(f"Iniciando scraping para {company_slug}, limite: {limit}, status: {status_filter or 'todos'}")
 
-    # Coleta URLs das reclamações
-    urls = get_complaint_urls(company_slug, limit, status_filter)
+    # Coleta URLs das reclamações e total de páginas
+    urls, total_pages = await get_complaint_urls(
+        company_slug, limit, status_filter, force_refresh
+    )
     logger.info(f"Encontradas {len(urls)} URLs de reclamações")
 
-    # Faz scraping de cada reclamação
+    # Faz scraping de todas as reclamações em paralelo
+    results = await asyncio.gather(
+        *(scrape_complaint(url, force_refresh) for url in urls),
+        return_exceptions=True,
+    )
+
     complaints: list[Complaint] = []
-    for i, url in enumerate(urls):
-        logger.info(f"Processando {i + 1}/{len(urls)}: {url}")
-        complaint = scrape_complaint(url)
-        if complaint:
-            complaints.append(complaint)
-
-    # Monta resposta
-    total_pages = get_total_pages(company_slug)
-
-    return ComplaintsResponse(
-        company=CompanyInfo(
-            name=company_slug.replace("-", " ").title(),
+    for url, result in zip(urls, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Erro ao processar {url}: {result}")
+        elif result:
+            complaints.append(result.to_model())
+
+    # Monta resposta (dados internos confiáveis; evita revalidar)
+    return ComplaintsResponse.model_construct(
+        company=CompanyInfo.model_construct(
+            name=_slug_to_display(company_slug),
             slug=company_slug,
             total_complaints=total_pages * 10,
         ),
@@ -361,79 +546,124 @@ def get_complaints(
     )
 
 
-def search_company(query: str) -> list[CompanyInfo]:
+async def iter_complaints(
+    company_slug: str,
+    limit: int = 10,
+    status_filter: str = "",
+    force_refresh: bool = False,
+) -> AsyncIterator[ComplaintMsg]:
+    """
+    Igual a get_complaints, mas entrega cada reclamação assim que o scraping
+    dela termina, em vez de esperar pela lista inteira.
+    """
+    urls, _ = await get_complaint_urls(company_slug, limit, status_filter, force_refresh)
+    logger.info(f"Streaming de {len(urls)} reclamações para {company_slug}")
+
+    # A concorrência já é limitada por _FC_SEM em _firecrawl_scrape
+    tasks = [asyncio.create_task(scrape_complaint(url, force_refresh)) for url in urls]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            complaint = await next_done
+            if complaint:
+                yield complaint
+    finally:
+        # Cliente desconectou ou o gerador foi fechado: cancela o que falta
+        for task in tasks:
+            task.cancel()
+
+
+async def _fetch_search_results(
+    query: str, force_refresh: bool = False
+) -> tuple[tuple[str, str], ...]:
+    """Busca empresas no Firecrawl (com cache Redis) e retorna pares (nome, slug)."""
+    search_url = _search_url(query)
+
+    key = make_key("search", query)
+    if not force_refresh:
+        cached = await cache_get_json(key)
+        if cached is not None:
+            logger.info(f"Cache hit (search): {query}")
+            return tuple((name, slug) for name, slug in cached)
+
+    # Usa wait para aguardar o carregamento dinâmico do JavaScript
+    logger.info(f"Buscando empresas: {query}")
+    result = await _firecrawl_scrape(
+        search_url,
+        formats=["markdown"],
+        actions=[
+            {"type": "wait", "milliseconds": 3000}
+        ]
+    )
+
+    # Busca sem markdown é tratada como erro para não ser memorizada
+    markdown = result.get("markdown") or ""
+    if not markdown:
+        raise ScraperError("Nenhum markdown retornado na busca")
+
+    # Procura links de empresas no markdown
+    # Formato: [Nome](https://www.reclameaqui.com.br/empresa/slug/)
+    matches = _SEARCH_LINK_RE.findall(markdown)
+
+    logger.info(f"Encontrados {len(matches)} matches de empresas")
+
+    # Usa dicionário para guardar o melhor nome para cada slug
+    slug_to_name: dict[str, str] = {}
+
+    for name, url, slug in matches:
+        # Filtra slugs inválidos
+        if ("lista-reclamacoes" in slug 
+            or len(slug) <= 1
+            or slug.startswith("ra-")):
+            continue
+
+        # Limpa o nome
+        clean_name = name.strip()
+
+        # Ignora nomes inválidos (muito curtos ou com markdown)
+        if (not clean_name 
+            or len(clean_name) <= 2 
+            or "**" in clean_name
+            or "\\" in clean_name
+            or "%" in clean_name):
+            continue
+
+        # Guarda o nome mais longo para cada slug
+        if slug not in slug_to_name or len(clean_name) > len(slug_to_name[slug]):
+            slug_to_name[slug] = clean_name
+
+    pairs = tuple((name, slug) for slug, name in slug_to_name.items())[:10]
+    for name, slug in pairs:
+        logger.info(f"Empresa encontrada: {name} ({slug})")
+
+    await cache_set_json(key, pairs, SEARCH_TTL)
+    return pairs
+
+
+@alru_cache(maxsize=1024, ttl=SEARCH_TTL)
+async def _search_company_impl(query: str) -> tuple[tuple[str, str], ...]:
+    """Versão memorizada em processo de _fetch_search_results."""
+    return await _fetch_search_results(query)
+
+
+async def search_company(query: str, force_refresh: bool = False) -> list[CompanyInfo]:
     """
     Busca empresas pelo nome usando Firecrawl.
 
     Args:
         query: Termo de busca
+        force_refresh: Ignora o cache e refaz a busca no Firecrawl
 
     Returns:
         Lista de empresas encontradas
     """
-    search_url = f"{BASE_URL}/busca/?q={query}"
-
     try:
-        # Usa wait para aguardar o carregamento dinâmico do JavaScript
-        logger.info(f"Buscando empresas: {query}")
-        result = firecrawl.scrape(
-            search_url,
-            formats=["markdown"],
-            actions=[
-                {"type": "wait", "milliseconds": 3000}
-            ]
-        )
-        
-        markdown = ""
-        if result and hasattr(result, 'markdown'):
-            markdown = result.markdown
-        elif isinstance(result, dict) and 'markdown' in result:
-            markdown = result['markdown']
-        
-        if not markdown:
-            logger.warning("Nenhum markdown retornado na busca")
-            return []
-        
-        # Procura links de empresas no markdown
-        # Formato: [Nome](https://www.reclameaqui.com.br/empresa/slug/)
-        pattern = r'\[([^\]]+)\]\((https://www\.reclameaqui\.com\.br/empresa/([^/\)]+)/?)\)'
-        matches = re.findall(pattern, markdown)
-        
-        logger.info(f"Encontrados {len(matches)} matches de empresas")
-
-        # Usa dicionário para guardar o melhor nome para cada slug
-        slug_to_name: dict[str, str] = {}
-        
-        for name, url, slug in matches:
-            # Filtra slugs inválidos
-            if ("lista-reclamacoes" in slug 
-                or len(slug) <= 1
-                or slug.startswith("ra-")):
-                continue
-            
-            # Limpa o nome
-            clean_name = name.strip()
-            
-            # Ignora nomes inválidos (muito curtos ou com markdown)
-            if (not clean_name 
-                or len(clean_name) <= 2 
-                or "**" in clean_name
-                or "\\" in clean_name
-                or "%" in clean_name):
-                continue
-            
-            # Guarda o nome mais longo para cada slug
-            if slug not in slug_to_name or len(clean_name) > len(slug_to_name[slug]):
-                slug_to_name[slug] = clean_name
-        
-        # Converte para lista de CompanyInfo
-        companies: list[CompanyInfo] = []
-        for slug, name in slug_to_name.items():
-            companies.append(CompanyInfo(name=name, slug=slug))
-            logger.info(f"Empresa encontrada: {name} ({slug})")
-
-        return companies[:10]
-
+        if force_refresh:
+            _search_company_impl.cache_invalidate(query)
+            pairs = await _fetch_search_results(query, force_refresh=True)
+        else:
+            pairs = await _search_company_impl(query)
     except Exception as e:
         logger.error(f"Erro na busca: {e}")
         return []
+
+    return [CompanyInfo(name=name, slug=slug) for name, slug in pairs]
@@ -0,0 +1,52 @@
+"""Estatísticas numéricas sobre as reclamações extraídas."""
+
+from typing import Optional
+
+import numpy as np
+from numba import njit
+
+from .models import Complaint
+
+# Notas de atendimento vão de 0 a 10
+_NOTE_BUCKETS = 11
+
+
+@njit(cache=True, fastmath=True)
+def _note_stats(notes: np.ndarray) -> tuple[float, np.ndarray]:
+    """Soma e histograma das notas (já filtradas para 0-10), em uma passada."""
+    histogram = np.zeros(_NOTE_BUCKETS, dtype=np.int64)
+    total = 0.0
+    for i in range(notes.size):
+        note = notes[i]
+        total += note
+        histogram[int(note)] += 1
+    return total, histogram
+
+
+def service_note_stats(
+    complaints: list[Complaint],
+) -> tuple[int, Optional[float], list[int]]:
+    """
+    Calcula quantidade de avaliações, nota média e histograma das notas.
+
+    Só o agregado numérico é compilado com Numba; a extração das notas
+    (strings) continua em Python.
+    """
+    values: list[float] = []
+    for complaint in complaints:
+        consideration = complaint.final_consideration
+        if not consideration or not consideration.service_note:
+            continue
+        try:
+            note = float(consideration.service_note)
+        except ValueError:
+            continue
+        if 0 <= note <= 10:
+            values.append(note)
+
+    if not values:
+        return 0, None, [0] * _NOTE_BUCKETS
+
+    notes = np.array(values, dtype=np.float32)
+    total, histogram = _note_stats(notes)
+    return notes.size, float(total) / notes.size, histogram.tolist()